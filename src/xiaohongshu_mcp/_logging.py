@@ -0,0 +1,53 @@
+"""日志配置模块"""
+
+import functools
+import sys
+from typing import Optional
+from loguru import logger
+
+# 控制台格式（带调用位置，供CLI调试使用）
+_CALLER_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
+    "<level>{message}</level>"
+)
+
+# 控制台格式（精简版）
+_SIMPLE_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+    "<level>{level: <8}</level> | "
+    "<level>{message}</level>"
+)
+
+# 日志文件格式（无颜色标记）
+_FILE_FORMAT = (
+    "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | "
+    "{name}:{function}:{line} - {message}"
+)
+
+
+@functools.lru_cache(maxsize=8)
+def configure(
+    level: str = "INFO",
+    include_caller: bool = False,
+    log_file: Optional[str] = None
+) -> None:
+    """配置loguru日志输出（相同参数的重复调用是空操作）"""
+    handlers = [
+        {
+            "sink": sys.stderr,
+            "format": _CALLER_FORMAT if include_caller else _SIMPLE_FORMAT,
+            "level": level
+        }
+    ]
+
+    if log_file:
+        handlers.append({
+            "sink": log_file,
+            "format": _FILE_FORMAT,
+            "level": level,
+            "rotation": "10 MB"
+        })
+
+    logger.configure(handlers=handlers)
@@ -1,11 +1,21 @@
 """Cookie管理模块"""
 
 import json
+import mmap
 import os
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from loguru import logger
 
+try:
+    import orjson
+except ImportError:
+    # orjson为可选的加速依赖，未安装时回退到标准库json
+    orjson = None
+
+# 小于该大小的文件直接read，mmap的建立开销反而更大
+_MMAP_MIN_SIZE = 4096
+
 
 class CookieManager:
     """Cookie管理器，负责保存和加载浏览器Cookies"""
@@ -20,26 +30,82 @@ class CookieManager:
         # 确保目录存在
         self.cookie_file.parent.mkdir(parents=True, exist_ok=True)
 
+        # 内存缓存，避免每次创建页面都重新读文件和解析JSON
+        self._cached: Optional[List[Dict[str, Any]]] = None
+        self._cached_hash: Optional[int] = None
+
+    @staticmethod
+    def _cookies_hash(cookies: List[Dict[str, Any]]) -> int:
+        """计算cookies的内容哈希，用于判断是否需要重新写盘"""
+        return hash(json.dumps(cookies, sort_keys=True, ensure_ascii=False))
+
+    def has_changed(self, cookies: List[Dict[str, Any]]) -> bool:
+        """判断给定cookies与最近一次加载/保存的内容是否不同"""
+        return self._cookies_hash(cookies) != self._cached_hash
+
     def save_cookies(self, cookies: List[Dict[str, Any]]) -> None:
-        """保存cookies到文件"""
+        """保存cookies到文件（内容未变化时跳过写盘）"""
         try:
-            with open(self.cookie_file, 'w', encoding='utf-8') as f:
-                json.dump(cookies, f, indent=2, ensure_ascii=False)
+            cookies_hash = self._cookies_hash(cookies)
+            if cookies_hash == self._cached_hash:
+                logger.debug("Cookies未变化，跳过写盘")
+                return
+
+            # 先在内存中完成编码，一次性写入，避免json.dump逐token写文件
+            if orjson is not None:
+                data = orjson.dumps(cookies, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(cookies, indent=2, ensure_ascii=False).encode('utf-8')
+
+            # 先写临时文件再原子替换，避免写一半崩溃留下损坏的cookie文件。
+            # 直接用os.open/os.write绕过Python缓冲层：一次open+write+close，
+            # 且创建时即设为0600权限（cookies属于登录凭据）
+            tmp_file = self.cookie_file.with_suffix('.json.tmp')
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, self.cookie_file)
+
+            self._cached = cookies
+            self._cached_hash = cookies_hash
             logger.info(f"Cookies已保存到: {self.cookie_file}")
         except Exception as e:
             logger.error(f"保存cookies失败: {e}")
             raise
 
     def load_cookies(self) -> List[Dict[str, Any]]:
-        """从文件加载cookies"""
+        """从文件加载cookies（优先返回内存缓存）"""
         try:
+            if self._cached is not None:
+                logger.debug(f"命中cookies缓存，共 {len(self._cached)} 个")
+                return self._cached
+
             if not self.cookie_file.exists():
                 logger.warning(f"Cookie文件不存在: {self.cookie_file}")
                 return []
 
-            with open(self.cookie_file, 'r', encoding='utf-8') as f:
-                cookies = json.load(f)
+            if self.cookie_file.stat().st_size >= _MMAP_MIN_SIZE:
+                # 较大文件用mmap直接映射页缓存解析，省去read()的整块拷贝
+                with open(self.cookie_file, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    view = memoryview(mm)
+                    try:
+                        if orjson is not None:
+                            cookies = orjson.loads(view)
+                        else:
+                            cookies = json.loads(view.tobytes())
+                    finally:
+                        view.release()
+            elif orjson is not None:
+                cookies = orjson.loads(self.cookie_file.read_bytes())
+            else:
+                with open(self.cookie_file, 'r', encoding='utf-8') as f:
+                    cookies = json.load(f)
 
+            self._cached = cookies
+            self._cached_hash = self._cookies_hash(cookies)
             logger.info(f"成功加载 {len(cookies)} 个cookies")
             return cookies
         except Exception as e:
@@ -48,9 +114,14 @@ class CookieManager:
 
     def clear_cookies(self) -> None:
         """清除保存的cookies"""
+        self._cached = None
+        self._cached_hash = None
         try:
-            if self.cookie_file.exists():
-                self.cookie_file.unlink()
-                logger.info("Cookies已清除")
+            # 直接unlink，不先exists()：省一次stat，也避免两次调用之间
+            # 文件被其他进程删除的竞态
+            self.cookie_file.unlink()
+            logger.info("Cookies已清除")
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.error(f"清除cookies失败: {e}")
\ No newline at end of file
@@ -5,8 +5,7 @@ import asyncio
 import sys
 from loguru import logger
 
-from .browser.driver import BrowserManager
-from .xiaohongshu.login import XiaohongshuLogin
+from ._logging import configure as configure_logging
 
 
 async def main_async():
@@ -33,22 +32,17 @@ async def main_async():
 
     # 配置日志
     log_level = "DEBUG" if args.verbose else "INFO"
-    logger.configure(
-        handlers=[
-            {
-                "sink": sys.stderr,
-                "format": "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-                         "<level>{level: <8}</level> | "
-                         "<level>{message}</level>",
-                "level": log_level
-            }
-        ]
-    )
+    configure_logging(level=log_level)
+
+    # 参数解析完成后再导入playwright相关模块，--help等快速路径不付加载成本
+    from .browser.driver import BrowserManager, shutdown as shutdown_browser
+    from .xiaohongshu.login import XiaohongshuLogin
 
-    # 创建浏览器管理器（使用无头模式以提高速度）
+    # 创建浏览器管理器（使用无头模式以提高速度，状态检查只看DOM，拦截静态资源）
     browser_manager = BrowserManager(
         headless=args.headless,
-        chrome_path=args.chrome_path
+        chrome_path=args.chrome_path,
+        block_assets=True
     )
 
     try:
@@ -85,6 +79,9 @@ async def main_async():
             logger.debug(f"详细错误信息:\n{traceback.format_exc()}")
         print("ERROR")  # 供脚本调用使用
         sys.exit(2)
+    finally:
+        # 必须趁事件循环还在时关闭共享浏览器，循环结束后就无法清理了
+        await shutdown_browser()
 
 
 def main():
@@ -5,8 +5,7 @@ import asyncio
 import sys
 from loguru import logger
 
-from .browser.driver import BrowserManager
-from .xiaohongshu.login import XiaohongshuLogin
+from ._logging import configure as configure_logging
 
 
 async def main_async():
@@ -26,18 +25,7 @@ async def main_async():
     args = parser.parse_args()
 
     # 配置日志
-    logger.configure(
-        handlers=[
-            {
-                "sink": sys.stderr,
-                "format": "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-                         "<level>{level: <8}</level> | "
-                         "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
-                         "<level>{message}</level>",
-                "level": "INFO"
-            }
-        ]
-    )
+    configure_logging(include_caller=True)
 
     # 登录时强制使用有界面模式，便于用户扫码
     headless = False if not args.headless else args.headless
@@ -45,6 +33,10 @@ async def main_async():
         logger.warning("登录过程建议使用有界面模式，将自动切换到有界面模式")
         headless = False
 
+    # 参数解析完成后再导入playwright相关模块，--help等快速路径不付加载成本
+    from .browser.driver import BrowserManager, shutdown as shutdown_browser
+    from .xiaohongshu.login import XiaohongshuLogin
+
     # 创建浏览器管理器
     browser_manager = BrowserManager(
         headless=headless,
@@ -91,6 +83,9 @@ async def main_async():
     except Exception as e:
         logger.error(f"登录过程中发生错误: {e}")
         sys.exit(1)
+    finally:
+        # 必须趁事件循环还在时关闭共享浏览器，循环结束后就无法清理了
+        await shutdown_browser()
 
 
 def main():
@@ -2,14 +2,16 @@
 
 import argparse
 import asyncio
+import os
+import stat
 import sys
-from pathlib import Path
 from typing import List
 from loguru import logger
 
-from .browser.driver import BrowserManager
-from .xiaohongshu.login import XiaohongshuLogin
-from .xiaohongshu.publish import XiaohongshuPublish
+from ._logging import configure as configure_logging
+
+# 支持的图片扩展名（不含点号，与rpartition('.')的结果对应）
+_ALLOWED_EXTS = frozenset({'jpg', 'jpeg', 'png', 'gif', 'webp'})
 
 
 async def main_async():
@@ -53,27 +55,22 @@ async def main_async():
     args = parser.parse_args()
 
     # 配置日志
-    logger.configure(
-        handlers=[
-            {
-                "sink": sys.stderr,
-                "format": "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-                         "<level>{level: <8}</level> | "
-                         "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
-                         "<level>{message}</level>",
-                "level": "INFO"
-            }
-        ]
-    )
+    configure_logging(include_caller=True)
 
     # 验证参数
-    if not validate_args(args):
+    if not await validate_args(args):
         sys.exit(1)
 
     if args.dry_run:
         logger.info("✅ 参数验证通过（预检模式）")
         return
 
+    # 参数验证通过后再导入playwright相关模块，
+    # --help/--dry-run等快速路径不付加载成本
+    from .browser.driver import BrowserManager, shutdown as shutdown_browser
+    from .xiaohongshu.login import XiaohongshuLogin
+    from .xiaohongshu.publish import XiaohongshuPublish
+
     # 发布时建议使用有界面模式
     headless = args.headless
     if not headless:
@@ -124,9 +121,12 @@ async def main_async():
     except Exception as e:
         logger.error(f"发布过程中发生错误: {e}")
         sys.exit(1)
+    finally:
+        # 必须趁事件循环还在时关闭共享浏览器，循环结束后就无法清理了
+        await shutdown_browser()
 
 
-def validate_args(args) -> bool:
+async def validate_args(args) -> bool:
     """验证命令行参数"""
     logger.info("验证发布参数...")
 
@@ -149,18 +149,28 @@ def validate_args(args) -> bool:
         logger.error("必须提供至少一个图片")
         return False
 
-    for image_path in args.images:
-        path = Path(image_path)
-        if not path.exists():
+    # 并发stat所有图片文件，IO等待相互重叠，也不会阻塞事件循环
+    stat_results = await asyncio.gather(
+        *[asyncio.to_thread(os.stat, image_path) for image_path in args.images],
+        return_exceptions=True
+    )
+
+    for image_path, st in zip(args.images, stat_results):
+        if isinstance(st, FileNotFoundError):
             logger.error(f"图片文件不存在: {image_path}")
             return False
 
-        if not path.is_file():
+        if isinstance(st, BaseException):
+            logger.error(f"无法访问图片文件: {image_path} ({st})")
+            return False
+
+        if not stat.S_ISREG(st.st_mode):
             logger.error(f"路径不是文件: {image_path}")
             return False
 
-        # 检查文件扩展名
-        if path.suffix.lower() not in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
+        # 检查文件扩展名（字符串切分即可，无需构造Path对象）
+        ext = image_path.rpartition('.')[2].lower()
+        if ext not in _ALLOWED_EXTS:
             logger.error(f"不支持的图片格式: {image_path}")
             return False
 
@@ -1,17 +1,120 @@
 """小红书MCP服务器"""
 
 import asyncio
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncGenerator, List, Optional
 from mcp.server.fastmcp import FastMCP
 from loguru import logger
 
-from xiaohongshu_mcp.browser.driver import BrowserManager
-from xiaohongshu_mcp.xiaohongshu.login import XiaohongshuLogin
-from xiaohongshu_mcp.xiaohongshu.publish import XiaohongshuPublish
+from xiaohongshu_mcp._logging import configure as configure_logging
+
+
+@asynccontextmanager
+async def _server_lifespan(_server: FastMCP) -> AsyncGenerator[None, None]:
+    """服务器生命周期钩子：退出前在事件循环内关闭共享浏览器上下文
+
+    持久化profile是登录态的唯一存储，必须经由Chromium的正常关停
+    落盘；事件循环一旦结束就无法再干净地关闭Playwright连接了
+    """
+    try:
+        yield
+    finally:
+        await _shutdown_shared_context()
 
 
 # 创建MCP服务器
-mcp = FastMCP("xiaohongshu-mcp")
+mcp = FastMCP("xiaohongshu-mcp", lifespan=_server_lifespan)
+
+# 服务器生命周期内共享的持久化浏览器上下文。登录态随profile目录自动持久化，
+# 每次工具调用只需新建/关闭一个Page，省去Chromium启动和cookie文件读写
+_ctx_lock = asyncio.Lock()
+_ctx_holder: dict = {}
+
+
+async def _get_shared_context(headless: bool, chrome_path: Optional[str]):
+    """懒启动并复用持久化BrowserContext"""
+    from playwright.async_api import async_playwright
+
+    async with _ctx_lock:
+        launch_key = (headless, chrome_path)
+        context = _ctx_holder.get("context")
+        if context is not None and _ctx_holder.get("launch_key") == launch_key:
+            return context
+
+        # 启动参数变化时重建上下文（同一profile目录不能同时打开两份）
+        if context is not None:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"关闭旧浏览器上下文失败: {e}")
+            _ctx_holder.pop("context", None)
+            _ctx_holder.pop("launch_key", None)
+
+        playwright = _ctx_holder.get("playwright")
+        if playwright is None:
+            playwright = await async_playwright().start()
+            _ctx_holder["playwright"] = playwright
+
+        launch_options = {
+            "user_data_dir": str(Path.home() / ".xiaohongshu_mcp" / "profile"),
+            "headless": headless,
+            "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                          "AppleWebKit/537.36 (KHTML, like Gecko) "
+                          "Chrome/120.0.0.0 Safari/537.36",
+            "args": [
+                "--no-sandbox",
+                "--disable-setuid-sandbox",
+                "--disable-dev-shm-usage",
+                "--disable-blink-features=AutomationControlled",
+            ]
+        }
+
+        if chrome_path:
+            launch_options["executable_path"] = chrome_path
+
+        context = await playwright.chromium.launch_persistent_context(**launch_options)
+        _ctx_holder["context"] = context
+        _ctx_holder["launch_key"] = launch_key
+        logger.info("已启动共享持久化浏览器上下文")
+        return context
+
+
+@asynccontextmanager
+async def _page_scope(
+    headless: bool,
+    chrome_path: Optional[str],
+    block_assets: bool = False
+) -> AsyncGenerator:
+    """在共享上下文中创建页面的上下文管理器"""
+    context = await _get_shared_context(headless, chrome_path)
+    page = await context.new_page()
+    try:
+        if block_assets:
+            # 只关心DOM的调用（如状态检查）拦截静态资源，减少下载量
+            from xiaohongshu_mcp.browser.driver import _block_asset_route
+            await page.route("**/*", _block_asset_route)
+        yield page
+    finally:
+        await page.close()
+
+
+async def _shutdown_shared_context() -> None:
+    """关闭共享的浏览器上下文和Playwright实例"""
+    async with _ctx_lock:
+        context = _ctx_holder.pop("context", None)
+        if context is not None:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"关闭浏览器上下文失败: {e}")
+
+        playwright = _ctx_holder.pop("playwright", None)
+        if playwright is not None:
+            await playwright.stop()
+
+        _ctx_holder.clear()
+
 
 @mcp.tool()
 async def xiaohongshu_login(
@@ -31,13 +134,10 @@ async def xiaohongshu_login(
     try:
         logger.info("开始小红书登录流程...")
 
-        # 创建浏览器管理器
-        browser_manager = BrowserManager(
-            headless=headless,
-            chrome_path=chrome_path
-        )
+        # 工具被调用时再导入playwright相关模块，加快服务器冷启动
+        from xiaohongshu_mcp.xiaohongshu.login import XiaohongshuLogin
 
-        async with browser_manager.get_page() as page:
+        async with _page_scope(headless, chrome_path) as page:
             # 创建登录处理器
             login_handler = XiaohongshuLogin(page)
 
@@ -75,13 +175,9 @@ async def xiaohongshu_check_status(
     try:
         logger.info("检查小红书登录状态...")
 
-        # 创建浏览器管理器
-        browser_manager = BrowserManager(
-            headless=headless,
-            chrome_path=chrome_path
-        )
+        from xiaohongshu_mcp.xiaohongshu.login import XiaohongshuLogin
 
-        async with browser_manager.get_page() as page:
+        async with _page_scope(headless, chrome_path, block_assets=True) as page:
             # 创建登录处理器
             login_handler = XiaohongshuLogin(page)
 
@@ -136,18 +232,15 @@ async def xiaohongshu_publish(
         if not image_paths:
             return "❌ 必须提供至少一个图片"
 
+        from xiaohongshu_mcp.xiaohongshu.login import XiaohongshuLogin
+        from xiaohongshu_mcp.xiaohongshu.publish import XiaohongshuPublish
+
         logger.info("开始发布小红书内容...")
         logger.info(f"标题: {title}")
         logger.info(f"内容: {content[:50]}..." if len(content) > 50 else f"内容: {content}")
         logger.info(f"图片: {image_paths}")
 
-        # 创建浏览器管理器
-        browser_manager = BrowserManager(
-            headless=headless,
-            chrome_path=chrome_path
-        )
-
-        async with browser_manager.get_page() as page:
+        async with _page_scope(headless, chrome_path) as page:
             # 检查登录状态
             login_handler = XiaohongshuLogin(page)
             is_logged_in = await login_handler.check_login_status()
@@ -180,24 +273,8 @@ async def xiaohongshu_publish(
 
 def main():
     """启动MCP服务器的主函数"""
-    import sys
-
     # 配置日志 - 同时输出到控制台和文件
-    logger.configure(
-        handlers=[
-            {
-                "sink": sys.stderr,
-                "format": "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{message}</cyan>",
-                "level": "INFO"
-            },
-            {
-                "sink": "logs/mcp_server.log",
-                "format": "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-                "level": "INFO",
-                "rotation": "10 MB"
-            }
-        ]
-    )
+    configure_logging(log_file="logs/mcp_server.log")
 
     logger.info("🚀 启动小红书MCP服务器...")
     logger.info("📋 可用工具:")
@@ -1,13 +1,28 @@
 """小红书登录模块"""
 
-import asyncio
 from loguru import logger
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 
+# 登录后页面才会出现的文本关键词，合并为正则交替式，
+# 对页面文本只需单次扫描而不是逐关键词各扫一遍
+_LOGIN_TEXT_PATTERN = "个人主页|我的|设置|退出登录|发布|创作中心"
+
 
 class XiaohongshuLogin:
     """小红书登录操作类"""
 
+    # 用户头像/用户相关元素选择器，任意一个命中即视为已登录
+    USER_INDICATORS = (
+        ".user-avatar",
+        "[class*='user']",
+        "[class*='avatar']",
+        ".header-user",
+        "[data-testid*='user']"
+    )
+
+    # 逗号连接为单一CSS选择器，浏览器一次DOM遍历即可匹配全部候选
+    _COMBINED_USER_SELECTOR = ", ".join(USER_INDICATORS)
+
     def __init__(self, page: Page):
         self.page = page
         self.base_url = "https://www.xiaohongshu.com/explore"
@@ -30,8 +45,15 @@ class XiaohongshuLogin:
             # 只等待domcontentloaded，不等待networkidle
             await self.page.wait_for_load_state("domcontentloaded")
 
-            # 等待页面基本元素加载
-            await asyncio.sleep(2)
+            # 等待登录指示器出现，最多2秒：已登录时几十毫秒即返回，
+            # 未登录时上限与原先的固定sleep(2)相同
+            try:
+                await self.page.wait_for_selector(
+                    f"{self.login_indicator}, {self._COMBINED_USER_SELECTOR}",
+                    timeout=2000
+                )
+            except PlaywrightTimeoutError:
+                pass
 
             # 尝试多种方式检查登录状态
             return await self._check_login_with_multiple_methods()
@@ -43,37 +65,27 @@ class XiaohongshuLogin:
     async def _check_login_with_multiple_methods(self) -> bool:
         """使用多种方法检查登录状态"""
 
-        # 方法1: 检查原始登录指示器
+        # 方法1+2: 主要登录指示器和用户相关元素合并为一个逗号选择器，
+        # 一次CDP往返、一次DOM遍历即可检查全部候选
         try:
-            login_element = await self.page.query_selector(self.login_indicator)
-            if login_element:
-                logger.info("✅ 通过主要指示器检测到已登录状态")
+            hit = await self.page.evaluate(
+                "(sel) => document.querySelector(sel) !== null",
+                f"{self.login_indicator}, {self._COMBINED_USER_SELECTOR}"
+            )
+            if hit:
+                logger.info("✅ 通过登录/用户指示器检测到已登录状态")
                 return True
         except Exception as e:
-            logger.debug(f"主要指示器检查失败: {e}")
-
-        # 方法2: 检查是否有用户头像或用户相关元素
-        user_indicators = [
-            ".user-avatar",
-            "[class*='user']",
-            "[class*='avatar']",
-            ".header-user",
-            "[data-testid*='user']"
-        ]
-
-        for indicator in user_indicators:
-            try:
-                element = await self.page.query_selector(indicator)
-                if element:
-                    logger.info(f"✅ 通过用户指示器 {indicator} 检测到已登录状态")
-                    return True
-            except Exception:
-                continue
-
-        # 方法3: 检查页面内容是否包含登录相关文本
+            logger.debug(f"批量指示器检查失败: {e}")
+
+        # 方法3: 在浏览器内用编译好的正则对页面文本做单次扫描，
+        # 只回传一个bool，避免page.content()把整个DOM序列化后传回Python
         try:
-            content = await self.page.content()
-            if any(keyword in content for keyword in ["个人主页", "我的", "设置", "退出登录", "发布", "创作中心"]):
+            found = await self.page.evaluate(
+                "(pattern) => new RegExp(pattern).test(document.body.innerText)",
+                _LOGIN_TEXT_PATTERN
+            )
+            if found:
                 logger.info("✅ 通过页面内容检测到已登录状态")
                 return True
         except Exception as e:
@@ -102,14 +114,15 @@ class XiaohongshuLogin:
             logger.info("开始登录流程...")
 
             # 导航到小红书探索页，这会触发登录弹窗
+            # 只等待domcontentloaded即可，networkidle会被站点的埋点长连接
+            # 拖到超时；真正的登录信号由后面的wait_for_selector提供
             await self.page.goto(self.base_url)
-            await self.page.wait_for_load_state("networkidle")
-
-            # 等待2秒让页面完全加载
-            await asyncio.sleep(2)
+            await self.page.wait_for_load_state("domcontentloaded")
+            await self.page.wait_for_selector("body", state="attached", timeout=5000)
 
-            # 检查是否已经登录
-            if await self.check_login_status():
+            # 检查是否已经登录：直接在当前页面上探测，
+            # 不走check_login_status()避免重复导航同一URL再等2秒
+            if await self._check_login_with_multiple_methods():
                 logger.info("已经处于登录状态，无需重新登录")
                 return True
 
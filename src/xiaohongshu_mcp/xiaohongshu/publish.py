@@ -2,10 +2,67 @@
 
 import asyncio
 import os
-from pathlib import Path
+import stat
 from typing import List
 from loguru import logger
-from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import (
+    Error as PlaywrightError,
+    Page,
+    TimeoutError as PlaywrightTimeoutError,
+    expect,
+)
+
+# 发布页各步骤的候选选择器。提升为模块级元组（以及预连接好的联合选择器），
+# 每次发布不再重建列表和字符串
+
+# "上传图文"选项卡的精确选择器
+TAB_SELECTORS = (
+    "[data-value='image']",  # 可能的data属性
+    "[class*='image']",      # 包含image的class
+    "div.creator-tab:nth-child(2)",  # 通常图文是第二个选项卡
+)
+TAB_SELECTOR_JOINED = ",".join(TAB_SELECTORS)
+
+# 编辑界面就绪的指示元素
+EDIT_INDICATORS = (
+    "div.d-input input",  # 标题输入框
+    ".d-input input",
+    "input[placeholder*='标题']",
+    "textarea",
+    ".ql-editor",  # 富文本编辑器
+    "[contenteditable='true']",  # 可编辑内容
+    ".publish-form",
+    ".edit-content",
+)
+EDIT_INDICATOR_JOINED = ",".join(EDIT_INDICATORS)
+
+# 标题输入框的候选选择器
+TITLE_SELECTORS = (
+    "div.d-input input",  # 标题输入框主选择器
+    ".d-input input",
+    "input[placeholder*='标题']",
+    "input[placeholder*='title']",
+    ".title-input",
+    "[class*='title'] input",
+    "textarea[placeholder*='标题']",
+    "input[type='text']",
+)
+TITLE_SELECTOR_JOINED = ",".join(TITLE_SELECTORS)
+
+# 内容输入框的页面内查找脚本：按固定优先级依次尝试富文本编辑器、
+# data-placeholder定位（原生closest()直达role=textbox祖先）、通用textarea，
+# 返回首个命中。三种方式在一次CDP往返内完成，优先级由脚本顺序保证
+CONTENT_FINDER_JS = """() => {
+    const editor = document.querySelector('div.ql-editor');
+    if (editor) return editor;
+    for (const p of document.querySelectorAll('p[data-placeholder]')) {
+        if (p.getAttribute('data-placeholder').includes('输入正文描述')) {
+            const textbox = p.closest('[role=textbox]');
+            if (textbox) return textbox;
+        }
+    }
+    return document.querySelector('textarea');
+}"""
 
 
 class XiaohongshuPublish:
@@ -14,6 +71,12 @@ class XiaohongshuPublish:
     def __init__(self, page: Page):
         self.page = page
         self.publish_url = "https://creator.xiaohongshu.com/publish/publish?source=official"
+        # 不带查询参数的发布页地址前缀，用于判断当前是否已在发布页
+        self._publish_page_prefix = "https://creator.xiaohongshu.com/publish/publish"
+        # 校验阶段解析好的图片绝对路径（已去重，保持顺序）
+        self._resolved_paths = ()
+        # 最近一次成功上传的文件集签名（排序路径+mtime），用于跳过重复传输
+        self._last_uploaded_sig = None
 
     async def publish_content(self, title: str, content: str, image_paths: List[str]) -> bool:
         """
@@ -30,13 +93,15 @@ class XiaohongshuPublish:
         try:
             logger.info("开始发布内容...")
 
-            # 验证图片文件
-            if not self._validate_images(image_paths):
+            # 图片校验是纯本地IO，放到线程中与页面导航并行执行，
+            # 校验耗时完全与导航重叠，不再占用关键路径
+            valid, _ = await asyncio.gather(
+                asyncio.to_thread(self._validate_images, image_paths),
+                self._navigate_to_publish_page()
+            )
+            if not valid:
                 return False
 
-            # 导航到发布页面
-            await self._navigate_to_publish_page()
-
             # 上传图片
             await self._upload_images(image_paths)
 
@@ -54,120 +119,190 @@ class XiaohongshuPublish:
             return False
 
     def _validate_images(self, image_paths: List[str]) -> bool:
-        """验证图片文件"""
+        """验证图片文件（在线程中运行，每个文件只做一次stat）"""
         if not image_paths:
             logger.error("图片列表不能为空")
             return False
 
         for path in image_paths:
-            if not Path(path).exists():
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
                 logger.error(f"图片文件不存在: {path}")
                 return False
+            except OSError as e:
+                logger.error(f"无法访问图片文件: {path} ({e})")
+                return False
 
-            if not Path(path).is_file():
+            if not stat.S_ISREG(st.st_mode):
                 logger.error(f"路径不是文件: {path}")
                 return False
 
-        logger.info(f"验证通过，共 {len(image_paths)} 个图片文件")
+        # 一次性解析为绝对路径并去重（dict保持顺序），
+        # 上传时直接传这个不可变元组，浏览器侧不必再逐个解析
+        self._resolved_paths = tuple(
+            dict.fromkeys(os.path.realpath(path) for path in image_paths)
+        )
+
+        logger.info("验证通过，共 {} 个图片文件", len(self._resolved_paths))
         return True
 
     async def _navigate_to_publish_page(self) -> None:
         """导航到发布页面"""
         logger.info("导航到小红书发布页面...")
 
-        # 设置更长的页面超时时间
-        await self.page.goto(self.publish_url, timeout=60000)
-        await self.page.wait_for_load_state("domcontentloaded")
+        # 同一页面重复发布时，整页导航的大头是文档加载和编辑器初始化；
+        # 已在发布页则尝试页内重置，失败再回退到整页导航
+        if self.page.url.startswith(self._publish_page_prefix):
+            if await self.reset_editor():
+                logger.debug("已在发布页面，跳过整页导航")
+                await self._click_upload_tab()
+                return
+            logger.debug("页内重置失败，回退到整页导航")
+
+        # 导航提交后立即返回，不等整页load：
+        # 后面的upload-content选择器等待才是下一步真正的门槛
+        await self.page.goto(self.publish_url, wait_until="commit", timeout=60000)
 
         # 关键：必须等待 upload-content 元素可见
-        logger.info("等待上传区域出现...")
+        logger.debug("等待上传区域出现...")
         try:
             await self.page.wait_for_selector("div.upload-content", timeout=15000)
-            logger.info("✅ upload-content 元素已出现")
+            logger.debug("✅ upload-content 元素已出现")
         except PlaywrightTimeoutError:
             raise Exception("upload-content 元素等待超时，发布页面可能未正确加载")
 
-        # 等待页面完全加载
-        await asyncio.sleep(1)
+        # 等待选项卡渲染完成即可继续，不再固定sleep
+        try:
+            await self.page.wait_for_selector("div.creator-tab", timeout=5000)
+        except PlaywrightTimeoutError:
+            logger.debug("未检测到选项卡元素，可能已在目标页面")
 
         # 点击"上传图文"选项卡
         await self._click_upload_tab()
 
-        # 再等待1秒确保页面稳定
-        await asyncio.sleep(1)
 
+    async def reset_editor(self) -> bool:
+        """页内重置编辑器回到新建发布状态，成功返回True
 
-    async def _click_upload_tab(self) -> None:
-        """点击上传图文选项卡"""
+        上一次发布完成后页面通常停留在成功页，点击页内的
+        "继续发布"类入口即可回到编辑器，省去整页重新加载
+        """
         try:
-            logger.info("查找上传图文选项卡...")
-
-            # 方法1: 尝试直接通过更精确的选择器
-            specific_selectors = [
-                "[data-value='image']",  # 可能的data属性
-                "[class*='image']",      # 包含image的class
-                "div.creator-tab:nth-child(2)",  # 通常图文是第二个选项卡
-            ]
-
-            for selector in specific_selectors:
-                try:
-                    element = await self.page.query_selector(selector)
-                    if element:
-                        await element.click()
-                        logger.info(f"✅ 通过选择器 {selector} 成功点击选项卡")
-                        await asyncio.sleep(1)
-                        return
-                except Exception:
-                    continue
+            # 扫描在页面内一次完成，只回传匹配入口的下标
+            idx = await self.page.evaluate(
+                """() => {
+                    const nodes = [...document.querySelectorAll('button, a, [class*="btn"]')];
+                    return nodes.findIndex(
+                        n => /继续发布|再发一篇|新的发布/.test(n.textContent || '')
+                    );
+                }"""
+            )
+            if idx >= 0:
+                await self.page.locator(
+                    'button, a, [class*="btn"]'
+                ).nth(idx).click(timeout=3000)
 
-            # 方法2: 如果精确选择器失败，回退到文本匹配（优化版）
-            tab_elements = await self.page.query_selector_all("div.creator-tab")
-            logger.info(f"找到 {len(tab_elements)} 个选项卡元素")
+            # 重置后（或本就停留在编辑器时）上传区域应当可用
+            await self.page.wait_for_selector("div.upload-content", timeout=5000)
+            return True
+        except (PlaywrightTimeoutError, PlaywrightError):
+            return False
 
-            for i, element in enumerate(tab_elements):
-                try:
-                    logger.debug(f"检查选项卡 {i+1}...")
+    async def _click_upload_tab(self) -> None:
+        """点击上传图文选项卡"""
+        try:
+            logger.debug("查找上传图文选项卡...")
 
-                    # 快速获取文本，设置短超时
-                    text = await asyncio.wait_for(
-                        element.text_content(),
-                        timeout=1.0  # 1秒超时
-                    )
+            # 方法1: 精确选择器逗号连接为一个查询，一次往返检查全部候选
+            try:
+                element = await self.page.query_selector(TAB_SELECTOR_JOINED)
+                if element:
+                    await element.click(timeout=5000)
+                    logger.debug("✅ 通过精确选择器成功点击选项卡")
+                    # 下一步要用上传输入框，直接等它出现而不是固定sleep
+                    await self._wait_for_upload_input()
+                    return
+            except Exception:
+                pass
 
-                    if text and "上传图文" in text:
-                        logger.info(f"✅ 找到并点击上传图文选项卡 (#{i+1})")
-                        await element.click()
-                        await asyncio.sleep(1)
-                        return
+            # 方法2: 如果精确选择器失败，回退到文本匹配。
+            # 整个扫描在页面内一次完成，只回传匹配选项卡的下标
+            idx = await self.page.evaluate(
+                """() => {
+                    const tabs = [...document.querySelectorAll('div.creator-tab')];
+                    return tabs.findIndex(t => (t.textContent || '').includes('上传图文'));
+                }"""
+            )
 
-                except asyncio.TimeoutError:
-                    logger.debug(f"选项卡 {i+1} 超时，跳过")
-                    continue
-                except Exception as e:
-                    logger.debug(f"选项卡 {i+1} 错误: {e}")
-                    continue
+            if idx >= 0:
+                logger.debug("✅ 找到并点击上传图文选项卡 (#{})", idx + 1)
+                await self.page.locator("div.creator-tab").nth(idx).click(timeout=5000)
+                await self._wait_for_upload_input()
+                return
 
             logger.info("未找到上传图文选项卡，可能已经在正确页面")
 
         except Exception as e:
             logger.warning(f"点击选项卡时出错: {e}，继续执行")
 
+    async def _wait_for_upload_input(self) -> None:
+        """点击选项卡后等待上传输入框就绪（下一步的真正前置条件）"""
+        try:
+            await self.page.wait_for_selector(".upload-input", timeout=5000)
+        except PlaywrightTimeoutError:
+            logger.debug("上传输入框未在预期时间内出现")
+
     async def _upload_images(self, image_paths: List[str]) -> None:
         """上传图片"""
-        logger.info(f"开始上传 {len(image_paths)} 个图片...")
+        logger.info("开始上传 {} 个图片...", len(image_paths))
+
+        # 使用校验阶段解析好的绝对路径
+        upload_paths = self._resolved_paths or tuple(image_paths)
+
+        # 计算文件集签名（排序路径+mtime）。同一会话内重复发布相同图片、
+        # 且上传输入框未被重置时，跳过整个传输，省去N次文件读取和CDP搬运
+        try:
+            sorted_paths = tuple(sorted(upload_paths))
+            upload_sig = (
+                sorted_paths,
+                tuple(os.stat(p).st_mtime_ns for p in sorted_paths)
+            )
+        except OSError:
+            upload_sig = None
+
+        if upload_sig is not None and upload_sig == self._last_uploaded_sig:
+            # 签名相同只说明文件集没变；重新导航或页内重置都会清空文件
+            # 输入框，必须确认输入框里确实还挂着等量文件才能跳过，
+            # 否则会发出一篇没有图片的笔记
+            try:
+                held = await self.page.evaluate(
+                    """() => {
+                        const input = document.querySelector('.upload-input');
+                        return input && input.files ? input.files.length : 0;
+                    }"""
+                )
+            except PlaywrightError:
+                held = 0
+
+            if held == len(upload_paths):
+                logger.info("✅ 文件集与上次上传一致且仍在输入框中，跳过重新传输")
+                return
+            self._last_uploaded_sig = None
 
         try:
             # 等待上传输入框出现，缩短超时时间
-            logger.info("等待上传输入框出现...")
+            logger.debug("等待上传输入框出现...")
             upload_input = await self.page.wait_for_selector(".upload-input", timeout=10000)
-            logger.info("✅ 找到上传输入框")
+            logger.debug("✅ 找到上传输入框")
 
             # 上传多个文件
-            await upload_input.set_input_files(image_paths)
-            logger.info(f"✅ 已设置 {len(image_paths)} 个文件进行上传")
+            await upload_input.set_input_files(upload_paths)
+            logger.info("✅ 已设置 {} 个文件进行上传", len(upload_paths))
 
             # 等待上传处理完成并转到编辑界面
             await self._wait_for_upload_complete()
+            self._last_uploaded_sig = upload_sig
 
         except PlaywrightTimeoutError:
             raise Exception("等待上传输入框超时，请检查页面是否正确加载")
@@ -178,50 +313,15 @@ class XiaohongshuPublish:
         """等待图片上传完成并进入编辑界面"""
         logger.info("等待图片上传完成并进入编辑界面...")
 
-        # 先等待基本的上传处理时间
-        await asyncio.sleep(3)
-
-        # 等待编辑界面的关键元素出现，这些是标题和内容输入框可能出现的时机
-        edit_indicators = [
-            "div.d-input input",  # 标题输入框
-            ".d-input input",
-            "input[placeholder*='标题']",
-            "textarea",
-            ".ql-editor",  # 富文本编辑器
-            "[contenteditable='true']",  # 可编辑内容
-            ".publish-form",
-            ".edit-content"
-        ]
-
-        # 最多等待15秒，让页面从上传状态转到编辑状态
-        for attempt in range(15):
-            logger.info(f"检查编辑界面是否就绪... (尝试 {attempt + 1}/15)")
-
-            for indicator in edit_indicators:
-                try:
-                    element = await self.page.query_selector(indicator)
-                    if element:
-                        logger.info(f"✅ 检测到编辑界面元素: {indicator}")
-                        logger.info("✅ 图片上传完成，编辑界面已就绪")
-                        return
-                except:
-                    continue
-
-            # 检查是否还在上传状态（只有file input的情况）
-            inputs = await self.page.query_selector_all("input")
-            file_inputs_only = all(
-                await input_elem.get_attribute("type") == "file"
-                for input_elem in inputs
-                if await input_elem.get_attribute("type")
-            )
-
-            if not file_inputs_only:
-                logger.info("✅ 页面已离开纯上传状态")
-                break
-
-            await asyncio.sleep(1)
-
-        logger.info("✅ 等待上传完成阶段结束，继续执行...")
+        # expect断言在浏览器事件循环内自动重试：编辑界面一就绪立即返回，
+        # 既没有固定等待也没有Python侧的逐秒轮询和日志
+        try:
+            await expect(
+                self.page.locator(EDIT_INDICATOR_JOINED).first
+            ).to_be_visible(timeout=18000)
+            logger.info("✅ 图片上传完成，编辑界面已就绪")
+        except (AssertionError, PlaywrightTimeoutError):
+            logger.warning("等待编辑界面超时，继续执行...")
 
     async def _fill_content(self, title: str, content: str) -> None:
         """填写标题和内容"""
@@ -243,56 +343,40 @@ class XiaohongshuPublish:
             # 先输出当前页面信息用于调试
             current_url = self.page.url
             page_title = await self.page.title()
-            logger.info(f"当前页面URL: {current_url}")
-            logger.info(f"当前页面标题: {page_title}")
-
-            # 尝试多种标题输入框选择器
-            title_selectors = [
-                "div.d-input input",  # 标题输入框主选择器
-                ".d-input input",
-                "input[placeholder*='标题']",
-                "input[placeholder*='title']",
-                ".title-input",
-                "[class*='title'] input",
-                "textarea[placeholder*='标题']",
-                "input[type='text']"
-            ]
-
-            title_input = None
-            for i, selector in enumerate(title_selectors):
+            logger.debug("当前页面URL: {}", current_url)
+            logger.debug("当前页面标题: {}", page_title)
+
+            # locator自带可见/可用/稳定的actionability检查和内部重试，
+            # 不再需要手动wait_for_selector后再fill；
+            # 选择器为预连接好的联合选择器，任意候选命中即生效
+            title_locator = self.page.locator(TITLE_SELECTOR_JOINED).first
+            try:
+                # 普通表单输入不会触发导航，no_wait_after跳过填写后的副作用等待
+                await title_locator.fill(title, no_wait_after=True, timeout=5000)
+            except PlaywrightTimeoutError:
+                title_locator = None
+
+            if title_locator is None:
+                # 调试信息：一次evaluate回传所有input的属性，
+                # 不再每个input各发3次get_attribute往返拖慢失败路径
+                logger.warning("未找到标题输入框，收集页面中的input元素信息...")
                 try:
-                    logger.info(f"尝试标题选择器 {i+1}/{len(title_selectors)}: {selector}")
-                    title_input = await self.page.wait_for_selector(selector, timeout=3000)
-                    if title_input:
-                        logger.info(f"✅ 找到标题输入框: {selector}")
-                        break
-                except PlaywrightTimeoutError:
-                    logger.debug(f"选择器 {selector} 未找到")
-                    continue
-
-            if not title_input:
-                # 输出页面的所有input元素用于调试
-                logger.warning("未找到标题输入框，查找页面中的所有input元素...")
-                inputs = await self.page.query_selector_all("input")
-                logger.info(f"页面中共有 {len(inputs)} 个input元素")
-
-                for i, input_elem in enumerate(inputs):
-                    try:
-                        placeholder = await input_elem.get_attribute("placeholder")
-                        class_name = await input_elem.get_attribute("class")
-                        input_type = await input_elem.get_attribute("type")
-                        logger.info(f"Input {i+1}: type={input_type}, placeholder='{placeholder}', class='{class_name}'")
-                    except:
-                        pass
+                    inputs_info = await self.page.evaluate(
+                        "() => [...document.querySelectorAll('input')]"
+                        ".map(i => ({type: i.type, placeholder: i.placeholder, cls: i.className}))"
+                    )
+                    logger.debug(f"页面中共有 {len(inputs_info)} 个input元素")
+                    for i, info in enumerate(inputs_info):
+                        logger.debug(
+                            "Input {}: type={}, placeholder='{}', class='{}'",
+                            i + 1, info['type'], info['placeholder'], info['cls']
+                        )
+                except Exception:
+                    pass
 
                 raise Exception("所有标题选择器都未找到")
 
-            # 填写标题内容
-            await title_input.fill(title)
-            logger.info(f"✅ 标题填写完成: {title}")
-
-            # 等待输入完成
-            await asyncio.sleep(1)
+            logger.info("✅ 标题填写完成: {}", title)
 
         except Exception as e:
             raise Exception(f"填写标题失败: {e}")
@@ -304,10 +388,9 @@ class XiaohongshuPublish:
             content_element = await self._find_content_element()
 
             if content_element:
-                # 填写正文内容
-                await content_element.fill(content)
+                # 填写正文内容（表单输入无导航副作用，无需事后等待）
+                await content_element.fill(content, no_wait_after=True)
                 logger.info("✅ 正文内容填写完成")
-                await asyncio.sleep(1)
             else:
                 raise Exception("未找到内容输入框")
 
@@ -317,88 +400,44 @@ class XiaohongshuPublish:
     async def _find_content_element(self):
         """查找内容输入框，尝试多种方式"""
         try:
-            # 方式1: 查找ql-editor
-            try:
-                element = await self.page.wait_for_selector("div.ql-editor", timeout=3000)
-                if element:
-                    logger.debug("使用ql-editor方式找到内容输入框")
-                    return element
-            except:
-                pass
-
-            # 方式2: 查找带placeholder的textbox
-            try:
-                element = await self._find_textbox_by_placeholder()
-                if element:
-                    logger.debug("使用placeholder方式找到内容输入框")
-                    return element
-            except:
-                pass
-
-            # 方式3: 通用textarea查找
-            try:
-                element = await self.page.wait_for_selector("textarea", timeout=3000)
-                if element:
-                    logger.debug("使用textarea方式找到内容输入框")
-                    return element
-            except:
-                pass
+            # 三种查找方式合并进同一段页面内脚本按优先级依次尝试：
+            # 编辑器页上也存在普通textarea（话题/标签输入框），必须让
+            # ql-editor确定性地优先命中。wait_for_function在浏览器侧
+            # 轮询重试，元素晚出现时也只占用一个3秒上限
+            handle = await self.page.wait_for_function(
+                CONTENT_FINDER_JS, timeout=3000
+            )
+            element = handle.as_element()
+            if element:
+                logger.debug("✅ 找到内容输入框")
+                return element
 
             logger.error("所有方式都未找到内容输入框")
             return None
 
+        except (PlaywrightTimeoutError, PlaywrightError):
+            logger.error("所有方式都未找到内容输入框")
+            return None
         except Exception as e:
             logger.error(f"查找内容输入框时出错: {e}")
             return None
 
-    async def _find_textbox_by_placeholder(self):
-        """通过placeholder查找textbox"""
-        try:
-            # 查找所有p元素
-            p_elements = await self.page.query_selector_all("p")
-
-            for element in p_elements:
-                placeholder = await element.get_attribute("data-placeholder")
-                if placeholder and "输入正文描述" in placeholder:
-                    # 向上查找textbox父元素
-                    current = element
-                    for _ in range(5):
-                        parent = await current.query_selector("xpath=..")
-                        if not parent:
-                            break
-
-                        role = await parent.get_attribute("role")
-                        if role == "textbox":
-                            return parent
-
-                        current = parent
-
-            return None
-
-        except Exception:
-            return None
-
     async def _submit_publish(self) -> None:
         """提交发布"""
         logger.info("提交发布...")
 
         try:
-            # 等待页面稳定
-            await asyncio.sleep(1)
-
-            # 查找提交按钮
-            logger.info("等待提交按钮...")
-            submit_button = await self.page.wait_for_selector(
-                "div.submit div.d-button-content",
-                timeout=10000
-            )
-            logger.info("✅ 找到提交按钮")
-
-            await submit_button.click()
+            # locator点击自带actionability等待（可见、稳定、可点击），
+            # 无需先wait_for_selector拿句柄再click
+            logger.debug("等待提交按钮...")
+            await self.page.locator("div.submit div.d-button-content").click(timeout=10000)
             logger.info("✅ 已点击发布按钮")
 
-            # 等待发布请求处理
-            await asyncio.sleep(3)
+            # 等待发布请求发出并得到响应，而不是固定等3秒
+            try:
+                await self.page.wait_for_load_state("networkidle", timeout=10000)
+            except PlaywrightTimeoutError:
+                pass
             logger.info("✅ 发布请求已提交")
 
         except PlaywrightTimeoutError: